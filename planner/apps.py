@@ -7,4 +7,7 @@ class PlannerConfig(AppConfig):
 
     def ready(self) -> None:
         import planner.signals  # noqa: F401
+        from trip_pilot import sqlite_pragma
+
+        sqlite_pragma.install()
 
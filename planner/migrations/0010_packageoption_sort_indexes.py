@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 15:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0009_savedplace'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='packageoption',
+            index=models.Index(fields=['plan', '-price_score', '-score', 'estimated_total_min', 'rank'], name='planner_pac_plan_id_5711bc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='packageoption',
+            index=models.Index(fields=['plan', 'estimated_total_min', '-score'], name='planner_pac_plan_id_157856_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='packageoption',
+            index=models.Index(fields=['plan', '-quality_score', 'estimated_total_min'], name='planner_pac_plan_id_58a954_idx'),
+        ),
+    ]
@@ -355,6 +355,10 @@ class PackageOption(TimeStampedModel):
         indexes = [
             models.Index(fields=["plan", "rank"]),
             models.Index(fields=["plan", "score"]),
+            # Back the results sort modes (see planner.views._sorted_packages).
+            models.Index(fields=["plan", "-price_score", "-score", "estimated_total_min", "rank"]),
+            models.Index(fields=["plan", "estimated_total_min", "-score"]),
+            models.Index(fields=["plan", "-quality_score", "estimated_total_min"]),
         ]
 
     def __str__(self) -> str:
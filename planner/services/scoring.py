@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 
 
 @dataclass
@@ -140,6 +141,35 @@ def _component_freshness(freshness_at: datetime | None) -> tuple[float, str]:
     return 34.0, "Price snapshot is stale and may drift."
 
 
+@lru_cache(maxsize=4096)
+def _time_independent_components(
+    total_minor: int,
+    budget_minor: int,
+    preference_items: tuple,
+    candidate_tags: tuple,
+    season_multiplier: float,
+    distance_band: str,
+    nonstop_likelihood: float,
+    timezone_delta_hours: float,
+    travel_time_minutes: int,
+    data_confidence: float,
+) -> tuple[tuple[float, str], ...]:
+    # Everything except freshness is a pure function of its inputs, so repeated
+    # (budget, route, tags) combinations across candidates hit the cache.
+    return (
+        _component_price_value(total_minor, budget_minor),
+        _component_convenience(
+            distance_band=distance_band,
+            nonstop_likelihood=nonstop_likelihood,
+            timezone_delta_hours=timezone_delta_hours,
+            travel_time_minutes=travel_time_minutes,
+        ),
+        _component_preference_match(dict(preference_items), list(candidate_tags)),
+        _component_seasonal_fit(season_multiplier),
+        _component_safety_fallback(data_confidence),
+    )
+
+
 def score_package(
     *,
     total_minor: int,
@@ -154,16 +184,31 @@ def score_package(
     travel_time_minutes: int = 0,
     data_confidence: float = 0.75,
 ) -> PackageScore:
-    price_value, price_note = _component_price_value(total_minor, budget_minor)
-    convenience, convenience_note = _component_convenience(
-        distance_band=distance_band,
-        nonstop_likelihood=nonstop_likelihood,
-        timezone_delta_hours=timezone_delta_hours,
-        travel_time_minutes=travel_time_minutes,
+    component_args = (
+        total_minor,
+        budget_minor,
+        tuple((preference_weights or {}).items()),
+        tuple(candidate_tags or ()),
+        season_multiplier,
+        distance_band,
+        nonstop_likelihood,
+        timezone_delta_hours,
+        travel_time_minutes,
+        data_confidence,
     )
-    preference_match, preference_note = _component_preference_match(preference_weights, candidate_tags)
-    seasonal_fit, seasonal_note = _component_seasonal_fit(season_multiplier)
-    safety_fallback, safety_note = _component_safety_fallback(data_confidence)
+    try:
+        components = _time_independent_components(*component_args)
+    except TypeError:
+        # Unhashable preference values; score without the cache.
+        components = _time_independent_components.__wrapped__(*component_args)
+    (
+        (price_value, price_note),
+        (convenience, convenience_note),
+        (preference_match, preference_note),
+        (seasonal_fit, seasonal_note),
+        (safety_fallback, safety_note),
+    ) = components
+    # Freshness depends on the current time and is never cached.
     freshness, freshness_note = _component_freshness(freshness_at)
 
     score = (
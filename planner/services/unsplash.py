@@ -11,6 +11,8 @@ from planner.services.http_client import build_http_client
 logger = logging.getLogger(__name__)
 
 _DESTINATION_DIR = Path(__file__).resolve().parents[1] / "static" / "img" / "destinations"
+HERO_IMAGES_CACHE_KEY = "hero_images:v1"
+HERO_IMAGES_CACHE_TIMEOUT = 60 * 60
 
 
 def _discover_local_image_pool() -> list[str]:
@@ -30,16 +32,14 @@ def _discover_local_image_pool() -> list[str]:
 LOCAL_IMAGE_POOL = _discover_local_image_pool()
 
 
-def get_destination_image(query: str) -> str:
-    key = os.getenv("UNSPLASH_ACCESS_KEY")
-    if not key:
-        return random.choice(LOCAL_IMAGE_POOL)
+HERO_DESTINATIONS = ("Paris", "Tokyo", "Bangkok", "Barcelona", "Vancouver")
 
-    cache_key = f"unsplash:{quote_plus(query.lower())}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
 
+def _destination_cache_key(query: str) -> str:
+    return f"unsplash:{quote_plus(query.lower())}"
+
+
+def _fetch_unsplash_image(query: str, key: str) -> str | None:
     url = "https://api.unsplash.com/photos/random"
     params = {"query": f"{query} travel city", "orientation": "landscape", "client_id": key}
     try:
@@ -48,13 +48,48 @@ def get_destination_image(query: str) -> str:
             response.raise_for_status()
             image_url = response.json().get("urls", {}).get("regular")
         if image_url:
-            cache.set(cache_key, image_url, timeout=60 * 60 * 12)
+            cache.set(_destination_cache_key(query), image_url, timeout=60 * 60 * 12)
             return image_url
     except httpx.HTTPError as exc:
         logger.warning("Unsplash request failed: %s", exc)
-    return random.choice(LOCAL_IMAGE_POOL)
+    return None
+
+
+def get_destination_image(query: str) -> str:
+    key = os.getenv("UNSPLASH_ACCESS_KEY")
+    if not key:
+        return random.choice(LOCAL_IMAGE_POOL)
+
+    cached = cache.get(_destination_cache_key(query))
+    if cached:
+        return cached
+    return _fetch_unsplash_image(query, key) or random.choice(LOCAL_IMAGE_POOL)
 
 
 def get_rotating_hero_images() -> list[str]:
-    destinations = ["Paris", "Tokyo", "Bangkok", "Barcelona", "Vancouver"]
-    return [get_destination_image(item) for item in destinations]
+    return [get_destination_image(item) for item in HERO_DESTINATIONS]
+
+
+def refresh_hero_images_cache() -> list[str]:
+    # Goes to Unsplash for every destination (skipping the 12h per-query cache) so each beat run
+    # actually rotates the set. A failed fetch keeps that slot's previously cached image; local
+    # fallbacks are never written to the hero cache.
+    key = os.getenv("UNSPLASH_ACCESS_KEY")
+    if not key:
+        return []
+    previous = cache.get(HERO_IMAGES_CACHE_KEY) or []
+    if len(previous) != len(HERO_DESTINATIONS):
+        previous = [None] * len(HERO_DESTINATIONS)
+    fetched = [_fetch_unsplash_image(item, key) for item in HERO_DESTINATIONS]
+    images = [image_url or prior for image_url, prior in zip(fetched, previous, strict=True)]
+    images = [image_url for image_url in images if image_url]
+    if any(fetched):
+        cache.set(HERO_IMAGES_CACHE_KEY, images, timeout=HERO_IMAGES_CACHE_TIMEOUT)
+    return images
+
+
+def get_cached_hero_images() -> list[str]:
+    # The hero cache is written only by the refresh task; until then fall back to the per-query cache.
+    if not os.getenv("UNSPLASH_ACCESS_KEY"):
+        return get_rotating_hero_images()
+    return cache.get(HERO_IMAGES_CACHE_KEY) or get_rotating_hero_images()
@@ -37,6 +37,7 @@ from planner.services.provider_registry import get_market_provider
 from planner.services.providers.base import ProviderException
 from planner.services.travelpayouts.fallbacks import tier_profile
 from planner.services.travelpayouts.types import CandidateEstimate
+from planner.services.unsplash import refresh_hero_images_cache
 from trip_pilot.logging import clear_request_context, set_request_context
 
 logger = logging.getLogger(__name__)
@@ -998,6 +999,11 @@ def refresh_fx_rates_daily(self) -> int:  # noqa: ARG001
     return count
 
 
+@shared_task
+def refresh_hero_images() -> int:
+    return len(refresh_hero_images_cache())
+
+
 @shared_task
 def cleanup_old_plans(days: int = 21) -> int:
     cutoff = timezone.now() - timezone.timedelta(days=days)
@@ -11,12 +11,17 @@ def is_external(value: str) -> bool:
     return isinstance(value, str) and (value.startswith("http") or value.startswith("/"))
 
 
-@register.filter
+_ZERO_MONEY: dict[str, str] = {}
+
+
+@register.filter(is_safe=True)
 def money(value, currency: str = "USD") -> str:  # noqa: ANN001
-    if value is None:
-        return f"{currency} 0.00"
-    amount = Decimal(value)
-    return f"{currency} {amount:,.2f}"
+    if not value or value == "0":
+        zero = _ZERO_MONEY.get(currency)
+        if zero is None:
+            zero = _ZERO_MONEY[currency] = f"{currency} 0.00"
+        return zero
+    return f"{currency} {Decimal(value):,.2f}"
 
 
 @register.filter
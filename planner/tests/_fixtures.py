@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from planner.models import Airport
+
+_AIRPORT_ROWS = (
+    {
+        "iata": "TBS",
+        "name": "Tbilisi International Airport",
+        "city": "Tbilisi",
+        "country": "Georgia",
+        "country_code": "GE",
+        "latitude": 41.6692,
+        "longitude": 44.9547,
+        "timezone": "Asia/Tbilisi",
+        "search_blob": "tbs tbilisi georgia",
+    },
+    {
+        "iata": "JFK",
+        "name": "John F Kennedy International Airport",
+        "city": "New York",
+        "country": "United States",
+        "country_code": "US",
+        "latitude": 40.6413,
+        "longitude": -73.7781,
+        "timezone": "America/New_York",
+        "search_blob": "jfk new york usa",
+    },
+)
+
+
+def seed_airports() -> None:
+    # One INSERT for both rows; re-seeding inside the same transaction is a no-op.
+    Airport.objects.bulk_create([Airport(**row) for row in _AIRPORT_ROWS], ignore_conflicts=True)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from importlib import import_module
+
+import pytest
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.db import transaction
+from django.test import override_settings
+
+from planner.tests import _fixtures
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _fast_password_hasher():
+    # Test users never need a strong hash; PBKDF2 would dominate per-test setup time.
+    with override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]):
+        yield
+
+
+@pytest.fixture
+def session_login():
+    # Write the auth session directly instead of running force_login (no last_login
+    # update, no user_logged_in signal); the client just carries the session cookie.
+    def login(client, user) -> None:  # noqa: ANN001
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = "django.contrib.auth.backends.ModelBackend"
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.save()
+        client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+
+    return login
+
+
+@pytest.fixture(scope="module")
+def module_db(django_db_setup, django_db_blocker):  # noqa: ANN001, ARG001
+    # One transaction around the module, rolled back when it finishes, so other modules never see
+    # what module-scoped fixtures create. Access stays blocked in between: those fixtures unblock
+    # while they build, and tests still need the django_db mark.
+    with django_db_blocker.unblock():
+        atomic = transaction.atomic()
+        atomic.__enter__()
+    try:
+        yield
+    finally:
+        with django_db_blocker.unblock():
+            transaction.set_rollback(True)
+            atomic.__exit__(None, None, None)
+
+
+@pytest.fixture(scope="module")
+def seed_airports(module_db, django_db_blocker):  # noqa: ANN001, ARG001
+    # Modules that create these airports themselves (or flush via transactional tests) are unaffected.
+    with django_db_blocker.unblock():
+        _fixtures.seed_airports()
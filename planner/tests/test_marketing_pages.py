@@ -1,10 +1,23 @@
 from __future__ import annotations
 
+import os
 from unittest.mock import patch
 
-from django.test import TestCase
+from django.contrib import messages
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
 from django.urls import reverse
 
+from planner.services.unsplash import (
+    HERO_DESTINATIONS,
+    HERO_IMAGES_CACHE_KEY,
+    get_cached_hero_images,
+    refresh_hero_images_cache,
+)
+from planner.views import _page_etag_seed, why_view
+
 
 class MarketingPagesTests(TestCase):
     def test_why_page_returns_200_and_contains_key_headings(self):
@@ -16,7 +29,7 @@ class MarketingPagesTests(TestCase):
         self.assertIn("How it works", html)
         self.assertIn("Links-only", html)
 
-    @patch("planner.views.get_rotating_hero_images", return_value=["img/destinations/travel-adventure-japan-night-landscape.jpg"])
+    @patch("planner.views.get_cached_hero_images", return_value=["img/destinations/travel-adventure-japan-night-landscape.jpg"])
     def test_navbar_contains_link_to_why(self, _mocked_hero_images):
         response = self.client.get(reverse("planner:landing"))
 
@@ -25,9 +38,87 @@ class MarketingPagesTests(TestCase):
         self.assertIn('href="/why/"', html)
         self.assertIn("Our Service", html)
 
-    @patch("planner.views.get_rotating_hero_images", return_value=["img/destinations/travel-adventure-japan-night-landscape.jpg"])
+    @patch("planner.views.get_cached_hero_images", return_value=["img/destinations/travel-adventure-japan-night-landscape.jpg"])
     def test_landing_page_contains_vibecoding_footer_line(self, _mocked_hero_images):
         response = self.client.get(reverse("planner:landing"))
 
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "Made by Baga with VIBECODING")
+
+    def test_why_page_answers_matching_etag_with_not_modified(self):
+        first = self.client.get(reverse("planner:why"))
+        self.assertIn("no-cache", first["Cache-Control"])
+        self.assertIn("private", first["Cache-Control"])
+        self.assertNotIn("max-age=300", first["Cache-Control"])
+
+        second = self.client.get(reverse("planner:why"), HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+
+    def test_page_etag_seed_is_the_release_when_configured(self):
+        _page_etag_seed.cache_clear()
+        self.addCleanup(_page_etag_seed.cache_clear)
+        with patch.dict(os.environ, {"RELEASE_VERSION": "release-abc"}):
+            self.assertEqual(_page_etag_seed(), "release-abc")
+
+    def test_why_page_skips_etag_while_flash_messages_are_pending(self):
+        request = RequestFactory().get(reverse("planner:why"))
+        request.user = AnonymousUser()
+        request._messages = CookieStorage(request)
+        messages.success(request, "Personal info updated.")
+
+        response = why_view(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("ETag"))
+        self.assertIn("no-store", response["Cache-Control"])
+        self.assertIn("Personal info updated.", response.content.decode())
+
+    @patch.dict(os.environ, {"UNSPLASH_ACCESS_KEY": "test-key"})
+    @patch("planner.services.unsplash._fetch_unsplash_image", return_value="https://images.unsplash.com/hero")
+    def test_hero_images_are_served_from_cache_after_refresh(self, mocked_fetch):
+        cache.delete(HERO_IMAGES_CACHE_KEY)
+        self.addCleanup(cache.delete, HERO_IMAGES_CACHE_KEY)
+
+        images = refresh_hero_images_cache()
+
+        self.assertEqual(images, ["https://images.unsplash.com/hero"] * len(HERO_DESTINATIONS))
+        self.assertEqual(mocked_fetch.call_count, len(HERO_DESTINATIONS))
+        self.assertEqual(get_cached_hero_images(), images)
+        self.assertEqual(mocked_fetch.call_count, len(HERO_DESTINATIONS))
+
+    @patch.dict(os.environ, {"UNSPLASH_ACCESS_KEY": "test-key"})
+    @patch("planner.services.unsplash._fetch_unsplash_image", return_value=None)
+    def test_hero_refresh_does_not_cache_fallback_images(self, mocked_fetch):
+        cache.delete(HERO_IMAGES_CACHE_KEY)
+        self.addCleanup(cache.delete, HERO_IMAGES_CACHE_KEY)
+
+        images = refresh_hero_images_cache()
+
+        self.assertEqual(images, [])
+        self.assertIsNone(cache.get(HERO_IMAGES_CACHE_KEY))
+
+    @patch.dict(os.environ, {"UNSPLASH_ACCESS_KEY": "test-key"})
+    def test_hero_refresh_keeps_previous_images_for_failed_fetches(self):
+        previous = [f"https://images.unsplash.com/old-{idx}" for idx in range(len(HERO_DESTINATIONS))]
+        cache.set(HERO_IMAGES_CACHE_KEY, previous)
+        self.addCleanup(cache.delete, HERO_IMAGES_CACHE_KEY)
+        fresh = {"Paris": "https://images.unsplash.com/paris", "Bangkok": "https://images.unsplash.com/bangkok"}
+
+        with patch("planner.services.unsplash._fetch_unsplash_image", side_effect=lambda query, _key: fresh.get(query)):
+            images = refresh_hero_images_cache()
+
+        expected = [fresh.get(item) or prior for item, prior in zip(HERO_DESTINATIONS, previous, strict=True)]
+        self.assertEqual(images, expected)
+        self.assertEqual(cache.get(HERO_IMAGES_CACHE_KEY), expected)
+
+    @patch.dict(os.environ, {"UNSPLASH_ACCESS_KEY": "test-key"})
+    @patch("planner.services.unsplash._fetch_unsplash_image", side_effect=["https://images.unsplash.com/paris", None, None, None, None])
+    def test_hero_refresh_without_previous_images_caches_only_fetched_urls(self, _mocked_fetch):
+        cache.delete(HERO_IMAGES_CACHE_KEY)
+        self.addCleanup(cache.delete, HERO_IMAGES_CACHE_KEY)
+
+        refresh_hero_images_cache()
+
+        self.assertEqual(cache.get(HERO_IMAGES_CACHE_KEY), ["https://images.unsplash.com/paris"])
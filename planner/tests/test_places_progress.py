@@ -63,6 +63,8 @@ def _create_plan_with_candidate(user: User) -> tuple[PlanRequest, DestinationCan
 
 
 class _FakeResponse:
+    __slots__ = ("status_code", "_payload")
+
     def __init__(self, status_code: int, payload: dict):
         self.status_code = status_code
         self._payload = payload
@@ -1,13 +1,12 @@
 from __future__ import annotations
 
-from html import unescape
-
 import pytest
 from django.contrib.auth.models import User
 from django.urls import reverse
 from rest_framework.test import APIClient
 
 from planner.models import SavedPlace
+from planner.views import SAVED_PLACES_PER_PAGE
 
 
 def _auth_client(user: User) -> APIClient:
@@ -17,7 +16,7 @@ def _auth_client(user: User) -> APIClient:
 
 
 @pytest.mark.django_db
-def test_profile_page_renders_personal_info_and_saved_places_list(client):
+def test_profile_page_renders_personal_info_and_saved_places_list(client, session_login):
     user = User.objects.create_user(
         username="profile_reader",
         password="safe-pass",
@@ -36,23 +35,73 @@ def test_profile_page_renders_personal_info_and_saved_places_list(client):
         outbound_url="https://en.wikipedia.org/wiki/Eiffel_Tower",
     )
 
-    client.force_login(user)
+    session_login(client, user)
     response = client.get(reverse("profile"), HTTP_HOST="localhost")
 
     assert response.status_code == 200
-    html = unescape(response.content.decode())
-    assert "Profile Defaults" not in html
-    assert "Places I Want to See" in html
-    assert "profile_reader" in html
-    assert "profile@example.com" in html
-    assert "Profile" in html
-    assert "Reader" in html
-    assert "Eiffel Tower" in html
-    assert "Paris" in html
+    content = response.content
+    assert b"Profile Defaults" not in content
+    assert b"Places I Want to See" in content
+    assert b"profile_reader" in content
+    assert b"profile@example.com" in content
+    assert b"Profile" in content
+    assert b"Reader" in content
+    assert b"Eiffel Tower" in content
+    assert b"Paris" in content
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("saved_count", [1, 5])
+def test_profile_page_query_count_does_not_scale_with_saved_places(
+    client, session_login, django_assert_num_queries, saved_count: int
+):
+    user = User.objects.create_user(username=f"profile_queries_{saved_count}", password="safe-pass")
+    SavedPlace.objects.bulk_create(
+        [
+            SavedPlace(
+                user=user,
+                name=f"Place {idx}",
+                city="Paris",
+                country="FR",
+                source="wikipedia",
+                external_id=f"wiki:place_{idx}",
+                outbound_url=f"https://en.wikipedia.org/wiki/Place_{idx}",
+            )
+            for idx in range(saved_count)
+        ],
+    )
+
+    session_login(client, user)
+    # session + user + saved places count + current page, regardless of how many places are listed.
+    with django_assert_num_queries(4):
+        response = client.get(reverse("profile"), HTTP_HOST="localhost")
+
+    assert response.status_code == 200
+    assert all(f"Place {idx}".encode() in response.content for idx in range(saved_count))
+
+
+@pytest.mark.django_db
+def test_profile_page_paginates_saved_places(client, session_login):
+    user = User.objects.create_user(username="profile_pages", password="safe-pass")
+    SavedPlace.objects.bulk_create(
+        [
+            SavedPlace(user=user, name=f"Paged Place {idx:02d}", source="manual", external_id=f"manual:paged_{idx}")
+            for idx in range(SAVED_PLACES_PER_PAGE + 1)
+        ],
+    )
+
+    session_login(client, user)
+    first_page = client.get(reverse("profile"), HTTP_HOST="localhost")
+    second_page = client.get(reverse("profile"), {"page": 2}, HTTP_HOST="localhost")
+
+    assert first_page.content.count(b'id="saved-place-') == SAVED_PLACES_PER_PAGE
+    assert f"{SAVED_PLACES_PER_PAGE + 1} saved places".encode() in first_page.content
+    assert b"Page 1 of 2" in first_page.content
+    assert second_page.content.count(b'id="saved-place-') == 1
 
 
 @pytest.mark.django_db
-def test_save_toggle_creates_savedplace_and_it_appears_in_profile(client, monkeypatch):
+def test_save_toggle_creates_savedplace_and_it_appears_in_profile(client, session_login, monkeypatch):
     monkeypatch.delenv("OUTBOUND_URL_ALLOWED_DOMAINS", raising=False)
     user = User.objects.create_user(username="place_saver", password="safe-pass", email="save@example.com")
     api = _auth_client(user)
@@ -82,16 +131,16 @@ def test_save_toggle_creates_savedplace_and_it_appears_in_profile(client, monkey
     assert saved_payload["count"] == 1
     assert saved_payload["results"][0]["name"] == "Louvre Museum"
 
-    client.force_login(user)
+    session_login(client, user)
     profile_response = client.get(reverse("profile"), HTTP_HOST="localhost")
-    html = unescape(profile_response.content.decode())
-    assert "Louvre Museum" in html
-    assert "Open" in html
-    assert "Remove" in html
+    content = profile_response.content
+    assert b"Louvre Museum" in content
+    assert b"Open" in content
+    assert b"Remove" in content
 
 
 @pytest.mark.django_db
-def test_save_toggle_is_user_isolated(client):
+def test_save_toggle_is_user_isolated(client, session_login):
     user_a = User.objects.create_user(username="user_a_places", password="safe-pass")
     user_b = User.objects.create_user(username="user_b_places", password="safe-pass")
 
@@ -113,11 +162,11 @@ def test_save_toggle_is_user_isolated(client):
     forbidden_toggle = api_b.post("/api/places/save-toggle", data={"saved_place_id": saved.id}, format="json")
     assert forbidden_toggle.status_code == 404
 
-    client.force_login(user_b)
+    session_login(client, user_b)
     profile_response = client.get(reverse("profile"), HTTP_HOST="localhost")
-    html = unescape(profile_response.content.decode())
-    assert "Colosseum" not in html
-    assert "No saved places yet" in html
+    content = profile_response.content
+    assert b"Colosseum" not in content
+    assert b"No saved places yet" in content
 
 
 @pytest.mark.django_db
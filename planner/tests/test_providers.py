@@ -8,6 +8,8 @@ from planner.services.travelpayouts.adapter import TravelpayoutsAdapter
 
 
 class DummyResponse:
+    __slots__ = ("_payload", "status_code", "request")
+
     def __init__(self, payload: dict, status_code: int = 200, url: str = "https://api.travelpayouts.com/test"):
         self._payload = payload
         self.status_code = status_code
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from planner.services.scoring import score_package
+from planner.services.scoring import _time_independent_components, score_package
 
 
 def test_score_package_components_shape():
@@ -84,3 +84,27 @@ def test_scoring_regression_expensive_longhaul_is_last():
 
     ranked_ids = [item[0] for item in sorted(ranked, key=lambda item: item[1], reverse=True)]
     assert ranked_ids[-1] == "expensive_longhaul"
+
+
+def test_score_package_reuses_static_components_but_not_freshness():
+    kwargs = {
+        "total_minor": 175_000,
+        "budget_minor": 210_000,
+        "preference_weights": {"culture": 1.0},
+        "candidate_tags": ["culture"],
+        "season_multiplier": 1.01,
+        "distance_band": "long",
+        "nonstop_likelihood": 0.5,
+        "timezone_delta_hours": 3,
+        "travel_time_minutes": 500,
+        "data_confidence": 0.8,
+    }
+    _time_independent_components.cache_clear()
+
+    fresh = score_package(freshness_at=datetime.now(tz=timezone.utc), **kwargs)
+    stale = score_package(freshness_at=datetime(2020, 1, 1, tzinfo=timezone.utc), **kwargs)
+
+    assert _time_independent_components.cache_info().hits == 1
+    assert fresh.price_score == stale.price_score
+    assert fresh.breakdown["freshness"] > stale.breakdown["freshness"]
+    assert fresh.explanations is not stale.explanations
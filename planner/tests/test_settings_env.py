@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import os
+
+from trip_pilot.settings import _load_env
+
+
+def test_load_env_parses_dotenv_lines_without_overriding(tmp_path, monkeypatch):
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "﻿TP_PLAIN=value\n"
+        "# comment\n"
+        "\n"
+        "export TP_EXPORTED=yes\n"
+        'TP_QUOTED="a # b"\n'
+        'TP_QUOTED_NOTE="abc" # note\n'
+        "TP_INLINE=kept # dropped\n"
+        "TP_EMPTY=\n"
+        "TP_PRESET=from-file\n"
+        "not a pair\n",
+        encoding="utf-8",
+    )
+    for key in ("TP_PLAIN", "TP_EXPORTED", "TP_QUOTED", "TP_QUOTED_NOTE", "TP_INLINE", "TP_EMPTY"):
+        # setenv first so monkeypatch removes whatever _load_env writes at teardown.
+        monkeypatch.setenv(key, "")
+        monkeypatch.delenv(key)
+    monkeypatch.setenv("TP_PRESET", "from-env")
+
+    _load_env(env_file)
+
+    assert os.environ["TP_PLAIN"] == "value"
+    assert os.environ["TP_EXPORTED"] == "yes"
+    assert os.environ["TP_QUOTED"] == "a # b"
+    assert os.environ["TP_QUOTED_NOTE"] == "abc"
+    assert os.environ["TP_INLINE"] == "kept"
+    assert os.environ["TP_EMPTY"] == ""
+    assert os.environ["TP_PRESET"] == "from-env"
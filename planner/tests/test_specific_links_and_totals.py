@@ -2,84 +2,110 @@ from __future__ import annotations
 
 from datetime import timedelta
 from decimal import Decimal
+from types import MappingProxyType
 
 import pytest
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.utils import timezone
 from rest_framework.test import APIClient
 
-from planner.models import Airport, DestinationCandidate, FlightOption, HotelOption, PlanRequest, TourOption
+from planner.models import DestinationCandidate, FlightOption, HotelOption, PlanRequest, TourOption
 from planner.serializers import PackageOptionSerializer, PlanStartSerializer
 from planner.services.package_builder import build_packages_for_plan
-
-
-def _seed_airports() -> None:
-    Airport.objects.update_or_create(
-        iata="TBS",
-        defaults={
-            "name": "Tbilisi International Airport",
-            "city": "Tbilisi",
-            "country": "Georgia",
-            "country_code": "GE",
-            "latitude": 41.6692,
-            "longitude": 44.9547,
-            "timezone": "Asia/Tbilisi",
-            "search_blob": "tbs tbilisi georgia",
-        },
-    )
-    Airport.objects.update_or_create(
-        iata="JFK",
-        defaults={
-            "name": "John F Kennedy International Airport",
-            "city": "New York",
-            "country": "United States",
-            "country_code": "US",
-            "latitude": 40.6413,
-            "longitude": -73.7781,
-            "timezone": "America/New_York",
-            "search_blob": "jfk new york usa",
-        },
-    )
+from planner.views import package_cards_partial, wizard_view
+
+pytestmark = pytest.mark.usefixtures("seed_airports")
+
+# Immutable factory defaults; JSON list/dict fields are still built per call.
+_PLAN_STATIC = MappingProxyType(
+    {
+        "origin_input": "TBS",
+        "origin_code": "TBS",
+        "origin_iata": "TBS",
+        "search_mode": PlanRequest.SearchMode.DIRECT,
+        "destination_iata": "JFK",
+        "destination_country": "US",
+        "date_mode": PlanRequest.DateMode.EXACT,
+        "trip_length_min": 5,
+        "trip_length_max": 5,
+        "nights_min": 5,
+        "nights_max": 5,
+        "total_budget": Decimal("2800.00"),
+        "travelers": 2,
+        "adults": 2,
+        "children": 0,
+        "search_currency": "USD",
+        "status": PlanRequest.Status.SCORING,
+    }
+)
+_FLIGHT_STATIC = MappingProxyType(
+    {
+        "provider": "travelpayouts",
+        "origin_airport": "TBS",
+        "destination_airport": "JFK",
+        "stops": 1,
+        "duration_minutes": 650,
+        "currency": "USD",
+        "total_price": Decimal("820.00"),
+    }
+)
+_HOTEL_STATIC = MappingProxyType(
+    {
+        "provider": "travelpayouts",
+        "name": "New York Central Hotel",
+        "star_rating": 4.2,
+        "guest_rating": 8.4,
+        "neighborhood": "Midtown",
+        "currency": "USD",
+        "total_price": Decimal("1100.00"),
+    }
+)
+
+_PLAN_START_DEPART = timezone.now().date() + timedelta(days=40)
+_PLAN_START_DATA = MappingProxyType(
+    {
+        "origin_iata": "TBS",
+        "destination_iata": "JFK",
+        "search_mode": "direct",
+        "departure_date_from": str(_PLAN_START_DEPART),
+        "departure_date_to": str(_PLAN_START_DEPART + timedelta(days=2)),
+        "trip_length_min": 4,
+        "trip_length_max": 6,
+        "adults": 2,
+        "children": 0,
+        "search_currency": "USD",
+    }
+)
 
 
 def _plan_and_candidate(user: User) -> tuple[PlanRequest, DestinationCandidate]:
     depart = timezone.now().date() + timedelta(days=33)
     ret = depart + timedelta(days=5)
-    plan = PlanRequest.objects.create(
-        user=user,
-        origin_input="TBS",
-        origin_code="TBS",
-        origin_iata="TBS",
-        search_mode=PlanRequest.SearchMode.DIRECT,
-        destination_iata="JFK",
-        destination_iatas=["JFK"],
-        destination_country="US",
-        date_mode=PlanRequest.DateMode.EXACT,
-        depart_date=depart,
-        return_date=ret,
-        departure_date_from=depart,
-        departure_date_to=depart,
-        trip_length_min=5,
-        trip_length_max=5,
-        nights_min=5,
-        nights_max=5,
-        total_budget=Decimal("2800.00"),
-        travelers=2,
-        adults=2,
-        children=0,
-        search_currency="USD",
-        status=PlanRequest.Status.SCORING,
-        explore_constraints={"origin_timezone": "Asia/Tbilisi"},
-    )
-    candidate = DestinationCandidate.objects.create(
-        plan=plan,
-        country_code="US",
-        city_name="New York",
-        airport_code="JFK",
-        timezone="America/New_York",
-        rank=1,
-        metadata={"tags": ["culture", "food"], "entities": {}},
-    )
+    with transaction.atomic():
+        plan = PlanRequest.objects.create(
+            **_PLAN_STATIC,
+            user=user,
+            destination_iatas=["JFK"],
+            depart_date=depart,
+            return_date=ret,
+            departure_date_from=depart,
+            departure_date_to=depart,
+            explore_constraints={"origin_timezone": "Asia/Tbilisi"},
+        )
+        [candidate] = DestinationCandidate.objects.bulk_create(
+            [
+                DestinationCandidate(
+                    plan=plan,
+                    country_code="US",
+                    city_name="New York",
+                    airport_code="JFK",
+                    timezone="America/New_York",
+                    rank=1,
+                    metadata={"tags": ["culture", "food"], "entities": {}},
+                )
+            ]
+        )
     return plan, candidate
 
 
@@ -98,18 +124,13 @@ def _attach_options(
     if hotel_link_type == "item":
         hotel_url = "https://www.booking.com/hotel/us/example-central.html?checkin=2026-07-01&checkout=2026-07-06"
 
-    FlightOption.objects.create(
+    now = timezone.now()
+    flight = FlightOption(
+        **_FLIGHT_STATIC,
         plan=plan,
         candidate=candidate,
-        provider="travelpayouts",
         external_offer_id="offer-abc123" if flight_link_type == "item" else "search-flight-1",
-        origin_airport="TBS",
-        destination_airport="JFK",
         airline_codes=["B6"],
-        stops=1,
-        duration_minutes=650,
-        currency="USD",
-        total_price=Decimal("820.00"),
         deeplink_url=flight_url,
         link_type=flight_link_type,
         raw_payload={
@@ -118,20 +139,14 @@ def _attach_options(
             "estimated_max": "900.00",
             "fallback_search": flight_link_type != "item",
         },
-        last_checked_at=timezone.now(),
+        last_checked_at=now,
     )
-    HotelOption.objects.create(
+    hotel = HotelOption(
+        **_HOTEL_STATIC,
         plan=plan,
         candidate=candidate,
-        provider="travelpayouts",
         external_offer_id="hotel-offer-1" if hotel_link_type == "item" else "search-hotel-1",
         provider_property_id="hotel-prop-001" if hotel_link_type == "item" else "search:hotel-prop-001",
-        name="New York Central Hotel",
-        star_rating=4.2,
-        guest_rating=8.4,
-        neighborhood="Midtown",
-        currency="USD",
-        total_price=Decimal("1100.00"),
         deeplink_url=hotel_url,
         link_type=hotel_link_type,
         raw_payload={
@@ -140,61 +155,97 @@ def _attach_options(
             "provider_property_id": "hotel-prop-001",
             "fallback_search": hotel_link_type != "item",
         },
-        last_checked_at=timezone.now(),
+        last_checked_at=now,
     )
-
+    tours = []
     if tour_link_type:
         tour_url = "https://www.getyourguide.com/s/?q=New+York+Walking+Tour"
         if tour_link_type == "item":
             tour_url = "https://www.getyourguide.com/new-york-l59/walking-tour-p12345/"
-        TourOption.objects.create(
-            plan=plan,
-            candidate=candidate,
-            provider="travelpayouts",
-            external_product_id="tour-product-1",
-            name="New York Walking Tour",
-            currency="USD",
-            total_price=Decimal("95.00"),
-            amount_minor=9500,
-            deeplink_url=tour_url,
-            link_type=tour_link_type,
-            raw_payload={"fallback_search": tour_link_type != "item"},
-            last_checked_at=timezone.now(),
+        tours.append(
+            TourOption(
+                plan=plan,
+                candidate=candidate,
+                provider="travelpayouts",
+                external_product_id="tour-product-1",
+                name="New York Walking Tour",
+                currency="USD",
+                total_price=Decimal("95.00"),
+                amount_minor=9500,
+                deeplink_url=tour_url,
+                link_type=tour_link_type,
+                raw_payload={"fallback_search": tour_link_type != "item"},
+                last_checked_at=now,
+            )
         )
 
+    with transaction.atomic():
+        FlightOption.objects.bulk_create([flight])
+        HotelOption.objects.bulk_create([hotel])
+        if tours:
+            TourOption.objects.bulk_create(tours)
 
-@pytest.mark.django_db
-def test_package_total_equals_sum_of_components():
-    user = User.objects.create_user(username="pkg_total_components", password="safe-pass")
-    plan, candidate = _plan_and_candidate(user)
-    _attach_options(plan=plan, candidate=candidate, flight_link_type="item", hotel_link_type="item")
-
-    [package] = build_packages_for_plan(plan, max_packages=1)
-    breakdown = package.price_breakdown
-
-    flight_total = Decimal(str(breakdown["flight"]["amount"]))
-    hotel_total = Decimal(str(breakdown["hotel"]["amount"]))
-    tours_total = Decimal(str(breakdown["tours"]["amount"]))
-    total = Decimal(str(breakdown["total"]["amount"]))
 
-    assert total == flight_total + hotel_total + tours_total
-    assert Decimal(str(package.total_price)) == total
-    assert Decimal(str(breakdown["package_total"])) == total
-
-
-@pytest.mark.django_db
-def test_package_contains_specific_item_links_when_ids_available():
-    user = User.objects.create_user(username="pkg_item_links", password="safe-pass")
+def _build_for_tour_link_type(tour_link_type: str) -> tuple[User, PlanRequest, list]:
+    user = User.objects.create_user(username=f"built_packages_{tour_link_type}", password="safe-pass")
     plan, candidate = _plan_and_candidate(user)
     _attach_options(
         plan=plan,
         candidate=candidate,
         flight_link_type="item",
         hotel_link_type="item",
-        tour_link_type="item",
+        tour_link_type=tour_link_type,
     )
-
     packages = build_packages_for_plan(plan, sort_mode="best_value", max_packages=4)
+    return user, plan, packages
+
+
+_BREAKDOWN_AMOUNT_KEYS = ("flight", "hotel", "tours", "optional_tours", "total", "package_total")
+
+
+def _breakdown_amounts(breakdown: dict) -> dict[str, Decimal]:
+    # Parse each breakdown amount once; missing components count as zero.
+    amounts = {}
+    for key in _BREAKDOWN_AMOUNT_KEYS:
+        value = breakdown.get(key) or {}
+        amounts[key] = Decimal((value.get("amount") if isinstance(value, dict) else value) or "0.00")
+    return amounts
+
+
+@pytest.fixture(scope="module")
+def _built_packages_by_tour_link_type(module_db, seed_airports, django_db_blocker):  # noqa: ANN001, ARG001
+    # build_packages_for_plan is the expensive step; run it once per tour link type for the module.
+    with django_db_blocker.unblock():
+        built = {tour_link_type: _build_for_tour_link_type(tour_link_type) for tour_link_type in ("item", "search")}
+        # Mark every built plan completed in one UPDATE; tests only read plan.id.
+        PlanRequest.objects.filter(pk__in=[plan.pk for _, plan, _ in built.values()]).update(
+            status=PlanRequest.Status.COMPLETED,
+            progress_percent=100,
+            progress_message="Completed",
+            updated_at=timezone.now(),
+        )
+    return built
+
+
+@pytest.fixture
+def built_packages(request, db, _built_packages_by_tour_link_type):  # noqa: ANN001, ARG001
+    return _built_packages_by_tour_link_type[getattr(request, "param", "item")]
+
+
+def test_package_total_equals_sum_of_components(built_packages):
+    _, _, packages = built_packages
+    package = packages[0]
+    breakdown = package.price_breakdown
+
+    amounts = _breakdown_amounts(breakdown)
+
+    assert amounts["total"] == amounts["flight"] + amounts["hotel"] + amounts["tours"]
+    assert package.total_price == amounts["total"]
+    assert amounts["package_total"] == amounts["total"]
+
+
+def test_package_contains_specific_item_links_when_ids_available(built_packages):
+    _, _, packages = built_packages
     assert packages
 
     first = packages[0]
@@ -214,89 +265,50 @@ def test_package_contains_specific_item_links_when_ids_available():
     assert tours[0]["deeplink_url"]
 
 
-@pytest.mark.django_db
-def test_no_search_urls_in_primary_results(client):
-    user = User.objects.create_user(username="pkg_no_search_primary", password="safe-pass")
-    plan, candidate = _plan_and_candidate(user)
-    _attach_options(
-        plan=plan,
-        candidate=candidate,
-        flight_link_type="item",
-        hotel_link_type="item",
-        tour_link_type="search",
-    )
-
-    [package] = build_packages_for_plan(plan, max_packages=1)
-    plan.status = PlanRequest.Status.COMPLETED
-    plan.progress_percent = 100
-    plan.progress_message = "Completed"
-    plan.save(update_fields=["status", "progress_percent", "progress_message", "updated_at"])
+@pytest.mark.parametrize("built_packages", ["search"], indirect=True)
+def test_no_search_urls_in_primary_results(rf, built_packages):
+    user, plan, packages = built_packages
 
-    payload = PackageOptionSerializer(package).data
+    payload = PackageOptionSerializer(packages[0]).data
 
     assert "searchresults" not in str(payload["components"]["flight"]["deeplink_url"]).lower()
     assert "/search" not in str(payload["components"]["flight"]["deeplink_url"]).lower()
     assert "searchresults" not in str(payload["components"]["hotel"]["deeplink_url"]).lower()
     assert "/search" not in str(payload["components"]["hotel"]["deeplink_url"]).lower()
 
-    client.force_login(user)
-    html = client.get(f"/plans/{plan.id}/packages/?sort=best_value", HTTP_HOST="localhost").content.decode().lower()
+    request = rf.get(f"/plans/{plan.id}/packages/?sort=best_value", HTTP_HOST="localhost")
+    request.user = user
+    html = package_cards_partial(request, str(plan.id)).content.decode().lower()
     assert "view flight" in html
     assert "view hotel" in html
     assert "searchresults.html" not in html
 
 
-@pytest.mark.django_db
-def test_total_excludes_tours():
-    user = User.objects.create_user(username="pkg_total_excludes_tours", password="safe-pass")
-    plan, candidate = _plan_and_candidate(user)
-    _attach_options(
-        plan=plan,
-        candidate=candidate,
-        flight_link_type="item",
-        hotel_link_type="item",
-        tour_link_type="item",
-    )
-    packages = build_packages_for_plan(plan, max_packages=2)
+def test_total_excludes_tours(built_packages):
+    _, _, packages = built_packages
     package = next((p for p in packages if p.selected_tour_option_ids), None)
     assert package is not None
     breakdown = package.price_breakdown
-    flight_total = Decimal(str(breakdown["flight"]["amount"]))
-    hotel_total = Decimal(str(breakdown["hotel"]["amount"]))
-    total = Decimal(str(breakdown["total"]["amount"]))
-    optional_tours_total = Decimal(str((breakdown.get("optional_tours") or {}).get("amount") or "0.00"))
+    amounts = _breakdown_amounts(breakdown)
 
-    assert optional_tours_total > Decimal("0.00")
-    assert total == (flight_total + hotel_total)
-    assert Decimal(str(package.total_price)) == total
+    assert amounts["optional_tours"] > Decimal("0.00")
+    assert amounts["total"] == amounts["flight"] + amounts["hotel"]
+    assert package.total_price == amounts["total"]
 
 
 @pytest.mark.django_db
-def test_cabin_class_removed(client):
-    _seed_airports()
+def test_cabin_class_removed(rf):
     user = User.objects.create_user(username="no_cabin_user", password="safe-pass")
 
-    depart = timezone.now().date() + timedelta(days=40)
     serializer = PlanStartSerializer(
-        data={
-            "origin_iata": "TBS",
-            "destination_iata": "JFK",
-            "search_mode": "direct",
-            "departure_date_from": str(depart),
-            "departure_date_to": str(depart + timedelta(days=2)),
-            "trip_length_min": 4,
-            "trip_length_max": 6,
-            "adults": 2,
-            "children": 0,
-            "search_currency": "USD",
-            "flight_filters": {"cabin": "business", "max_stops": 1},
-        },
+        data={**_PLAN_START_DATA, "flight_filters": {"cabin": "business", "max_stops": 1}},
     )
     assert serializer.is_valid(), serializer.errors
     assert serializer.validated_data["flight_filters"] == {"max_stops": 1}
 
-    client.force_login(user)
-    wizard_html = client.get("/planner/", HTTP_HOST="localhost").content.decode().lower()
+    request = rf.get("/planner/", HTTP_HOST="localhost")
+    request.user = user
+    wizard_html = wizard_view(request).content.decode().lower()
     assert "id_cabin" not in wizard_html
     assert "economy" not in wizard_html
     assert "business" not in wizard_html
@@ -315,43 +327,14 @@ def test_cabin_class_removed(client):
 
 @pytest.mark.django_db
 def test_budget_removed():
-    _seed_airports()
-    depart = timezone.now().date() + timedelta(days=40)
-    serializer = PlanStartSerializer(
-        data={
-            "origin_iata": "TBS",
-            "destination_iata": "JFK",
-            "search_mode": "direct",
-            "departure_date_from": str(depart),
-            "departure_date_to": str(depart + timedelta(days=2)),
-            "trip_length_min": 4,
-            "trip_length_max": 6,
-            "adults": 2,
-            "children": 0,
-            "search_currency": "USD",
-            "total_budget": "2000.00",
-        },
-    )
+    serializer = PlanStartSerializer(data={**_PLAN_START_DATA, "total_budget": "2000.00"})
     assert serializer.is_valid() is False
     assert "total_budget" in serializer.errors
 
 
-@pytest.mark.django_db
-def test_packages_endpoint_returns_concrete_components():
-    user = User.objects.create_user(username="packages_endpoint_components", password="safe-pass")
-    plan, candidate = _plan_and_candidate(user)
-    _attach_options(
-        plan=plan,
-        candidate=candidate,
-        flight_link_type="item",
-        hotel_link_type="item",
-        tour_link_type="search",
-    )
-    build_packages_for_plan(plan, max_packages=1)
-    plan.status = PlanRequest.Status.COMPLETED
-    plan.progress_percent = 100
-    plan.progress_message = "Completed"
-    plan.save(update_fields=["status", "progress_percent", "progress_message", "updated_at"])
+@pytest.mark.parametrize("built_packages", ["search"], indirect=True)
+def test_packages_endpoint_returns_concrete_components(built_packages):
+    user, plan, _ = built_packages
 
     client = APIClient()
     client.force_authenticate(user=user)
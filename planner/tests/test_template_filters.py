@@ -7,3 +7,4 @@ def test_money_filter_preserves_cents():
     assert money(Decimal("1620.95"), "USD") == "USD 1,620.95"
     assert money("0", "USD") == "USD 0.00"
     assert money(None, "USD") == "USD 0.00"
+    assert money(Decimal("0.00"), "EUR") == "EUR 0.00"
@@ -4,7 +4,7 @@ from planner import views
 
 app_name = "planner"
 
-urlpatterns = [
+urlpatterns = (
     path("", views.landing, name="landing"),
     path("why/", views.why_view, name="why"),
     path("planner/", views.wizard_view, name="wizard"),
@@ -14,4 +14,4 @@ urlpatterns = [
     path("packages/<uuid:package_id>/toggle-save/", views.toggle_save_package, name="toggle-save"),
     path("p/<str:token>/pkg/<uuid:package_id>/", views.package_detail_public_view, name="package-detail-public"),
     path("share/<str:token>/", views.public_share_view, name="share"),
-]
+)
@@ -1,28 +1,72 @@
+import hashlib
+import json
+import os
+import time
+from functools import lru_cache, wraps
 from typing import Any
-from uuid import uuid4
 from pathlib import Path
+from types import MappingProxyType
+from uuid import uuid4
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
-from django.http import Http404, HttpRequest, HttpResponse
+from django.core.paginator import Paginator
+from django.db.models import Count, Max
+from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.templatetags.static import static
+from django.utils.cache import add_never_cache_headers, patch_cache_control
+from django.utils.functional import SimpleLazyObject
 from django.views.decorators.cache import never_cache
-from django.views.decorators.http import require_GET, require_http_methods, require_POST
+from django.views.decorators.http import condition, require_GET, require_http_methods, require_POST
+from django.views.decorators.vary import vary_on_headers
 
 from planner.forms import PlannerWizardForm, SignUpForm, UserPersonalInfoForm
 from planner.models import PackageOption, PlanRequest, SavedPackage, SavedPlace
 from planner.services.plan_service import create_plan_request
 from planner.services.provider_registry import provider_status
-from planner.services.unsplash import get_rotating_hero_images
+from planner.services.unsplash import get_cached_hero_images
 
-WIZARD_IDEMPOTENCY_SESSION_KEY = "planner_wizard_idempotency_key"
-WHY_IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".avif"}
+WIZARD_IDEMPOTENCY_COOKIE = "wiz_ik"
+WIZARD_IDEMPOTENCY_SALT = "planner.views.wizard_idempotency_key"
+WIZARD_IDEMPOTENCY_MAX_AGE = 3600
+WHY_IMAGE_EXTS = frozenset({".jpg", ".jpeg", ".png", ".webp", ".gif", ".avif"})
 VISIBLE_PACKAGE_LIMIT = 1
-
-
-def _why_image_paths() -> list[str]:
+SAVED_PLACES_PER_PAGE = 24
+# Rows fetched per sort before dedupe; headroom for duplicates without loading the whole plan.
+VISIBLE_PACKAGE_SCAN_LIMIT = max(VISIBLE_PACKAGE_LIMIT * 8, 16)
+HERO_ROTATION_SECONDS = 300
+# Resolved through the static manifest on first render, then reused for the process lifetime.
+_SAVED_PLACE_FALLBACK_IMAGE = SimpleLazyObject(lambda: static("img/destinations/travel-adventure-japan-night-landscape.jpg"))
+
+
+# Provider payload blobs the cards and dedupe signature never read; dropping them keeps rows narrow.
+_CARD_DEFERRED_FIELDS = (
+    "flight_entities",
+    "hotel_entities",
+    "component_links",
+    "candidate__metadata",
+    "flight_option__raw_payload",
+    "hotel_option__raw_payload",
+    "hotel_option__amenities",
+)
+
+_SORT_ORDERS: dict[str, tuple[str, ...]] = {
+    "budget_first": ("-price_score", "estimated_total_min", "-score", "rank"),
+    "cheapest": ("estimated_total_min", "-score"),
+    "fastest": ("flight_option__duration_minutes", "estimated_total_min"),
+    "fewest_stops": ("flight_option__stops", "flight_option__duration_minutes", "estimated_total_min"),
+    "family_friendly": ("-quality_score", "-convenience_score", "estimated_total_min"),
+    "best_hotel": ("-quality_score", "estimated_total_min"),
+}
+_DEFAULT_SORT_ORDER = ("-price_score", "-score", "estimated_total_min", "rank")
+
+
+@lru_cache(maxsize=1)
+def _why_image_paths() -> tuple[str, ...]:
+    # Static folders do not change while the process runs; scan them once.
     static_root = Path(__file__).resolve().parent / "static"
     # Prefer the user-provided image folder under static/img/why, keep legacy fallback.
     candidate_folders = [
@@ -38,31 +82,21 @@ def _why_image_paths() -> list[str]:
             if item.is_file() and item.suffix.lower() in WHY_IMAGE_EXTS
         )
         if files:
-            return [f"{static_prefix}/{name}" for name in files]
-    return []
-
-
-def _sorted_packages(plan: PlanRequest, sort_mode: str):
-    queryset = plan.package_options.select_related("flight_option", "hotel_option", "candidate").prefetch_related("tour_options")
-    if sort_mode == "budget_first":
-        queryset = queryset.order_by("-price_score", "estimated_total_min", "-score", "rank")
-    elif sort_mode == "cheapest":
-        queryset = queryset.order_by("estimated_total_min", "-score")
-    elif sort_mode == "fastest":
-        queryset = queryset.order_by("flight_option__duration_minutes", "estimated_total_min")
-    elif sort_mode == "fewest_stops":
-        queryset = queryset.order_by("flight_option__stops", "flight_option__duration_minutes", "estimated_total_min")
-    elif sort_mode == "family_friendly":
-        queryset = queryset.order_by("-quality_score", "-convenience_score", "estimated_total_min")
-    elif sort_mode == "best_hotel":
-        queryset = queryset.order_by("-quality_score", "estimated_total_min")
-    else:
-        queryset = queryset.order_by("-price_score", "-score", "estimated_total_min", "rank")
-    return _dedupe_visible_packages(list(queryset))
+            return tuple(f"{static_prefix}/{name}" for name in files)
+    return ()
+
+
+def _sorted_packages(plan: PlanRequest, sort_mode: str, limit: int | None = None):
+    # Cards render tours from component_summary, so the tour_options M2M is never read here.
+    queryset = plan.package_options.select_related("flight_option", "hotel_option", "candidate").defer(
+        *_CARD_DEFERRED_FIELDS
+    )
+    queryset = queryset.order_by(*_SORT_ORDERS.get(sort_mode, _DEFAULT_SORT_ORDER))
+    return _dedupe_visible_packages(list(queryset[:VISIBLE_PACKAGE_SCAN_LIMIT]), limit=limit)
 
 
 def _visible_packages(plan: PlanRequest, sort_mode: str) -> list[PackageOption]:
-    return _sorted_packages(plan, sort_mode)[:VISIBLE_PACKAGE_LIMIT]
+    return _sorted_packages(plan, sort_mode, limit=VISIBLE_PACKAGE_LIMIT)
 
 
 def _pkg_norm_text(value: Any) -> str:
@@ -79,6 +113,12 @@ def _package_visible_signature(package: PackageOption) -> tuple:
     flight_summary = component_summary.get("flight") or {}
     hotel_summary = component_summary.get("hotel") or {}
     tour_summary = component_summary.get("tours") or []
+    # isinstance already rules out None, so read the dicts directly instead of via `raw or {}`.
+    tour_signature = tuple(
+        _pkg_norm_link(raw.get("outbound_url") or raw.get("link"))
+        for raw in tour_summary[:3]
+        if isinstance(raw, dict)
+    )
     return (
         _pkg_norm_text(package.candidate.airport_code),
         _pkg_norm_text(package.candidate.city_name),
@@ -97,48 +137,106 @@ def _package_visible_signature(package: PackageOption) -> tuple:
         _pkg_norm_link(hotel_summary.get("outbound_url") or package.hotel_url or package.hotel_option.deeplink_url),
         _pkg_norm_link(package.tours_url),
         tuple(str(item) for item in (package.selected_tour_option_ids or [])),
-        tuple(
-            _pkg_norm_link((raw or {}).get("outbound_url") or (raw or {}).get("link"))
-            for raw in tour_summary[:3]
-            if isinstance(raw, dict)
-        ),
+        tour_signature,
     )
 
 
-def _dedupe_visible_packages(packages: list[PackageOption]) -> list[PackageOption]:
-    deduped: list[PackageOption] = []
-    seen: set[tuple] = set()
+def _dedupe_visible_packages(packages: list[PackageOption], limit: int | None = None) -> list[PackageOption]:
+    # First package per signature wins; stop computing signatures once enough are kept.
+    unique: dict[tuple, PackageOption] = {}
     for package in packages:
-        signature = _package_visible_signature(package)
-        if signature in seen:
-            continue
-        seen.add(signature)
-        deduped.append(package)
-    return deduped
+        unique.setdefault(_package_visible_signature(package), package)
+        if limit is not None and len(unique) >= limit:
+            break
+    return list(unique.values())
 
 
-def _plan_for_user_or_404(user, plan_id: str) -> PlanRequest:  # noqa: ANN001
-    plan = get_object_or_404(PlanRequest, pk=plan_id)
-    if plan.user_id != user.id:
-        raise Http404("Plan not found")
-    return plan
+def _plan_for_user_or_404(user, plan_id: str, queryset=PlanRequest) -> PlanRequest:  # noqa: ANN001
+    # Ownership is part of the lookup, so another user's plan is indistinguishable from a missing one.
+    return get_object_or_404(queryset, pk=plan_id, user_id=user.id)
 
 
-def _get_or_create_wizard_idempotency_key(request: HttpRequest) -> str:
-    if not request.session.session_key:
-        request.session.create()
-    key = str(request.session.get(WIZARD_IDEMPOTENCY_SESSION_KEY) or "").strip()
+def _get_wizard_idempotency_key(request: HttpRequest) -> tuple[str, bool]:
+    # Kept in a signed cookie so the wizard never touches the session; returns (key, is_new).
+    key = request.get_signed_cookie(
+        WIZARD_IDEMPOTENCY_COOKIE,
+        default=None,
+        salt=WIZARD_IDEMPOTENCY_SALT,
+        max_age=WIZARD_IDEMPOTENCY_MAX_AGE,
+    )
     if key:
-        return key
-    key = uuid4().hex
-    request.session[WIZARD_IDEMPOTENCY_SESSION_KEY] = key
-    return key
+        return key, False
+    return uuid4().hex, True
+
+
+def _set_wizard_idempotency_cookie(response: HttpResponse, key: str) -> None:
+    response.set_signed_cookie(
+        WIZARD_IDEMPOTENCY_COOKIE,
+        key,
+        salt=WIZARD_IDEMPOTENCY_SALT,
+        max_age=WIZARD_IDEMPOTENCY_MAX_AGE,
+        httponly=True,
+        samesite="Lax",
+        secure=settings.SESSION_COOKIE_SECURE,
+    )
+
+
+@lru_cache(maxsize=1)
+def _page_etag_seed() -> str:
+    # Identical across every worker and instance of one deploy, so any of them can answer a 304:
+    # the release commit when the platform exposes it, else a hash of templates + static manifest.
+    release = os.getenv("RELEASE_VERSION") or os.getenv("RENDER_GIT_COMMIT")
+    if release:
+        return release
+    digest = hashlib.md5(usedforsecurity=False)
+    sources = [settings.BASE_DIR / "templates", Path(__file__).resolve().parent / "templates"]
+    for root in sources:
+        for path in sorted(root.rglob("*.html")) if root.is_dir() else ():
+            digest.update(path.read_bytes())
+    manifest = Path(settings.STATIC_ROOT) / "staticfiles.json"
+    if manifest.is_file():
+        digest.update(manifest.read_bytes())
+    return digest.hexdigest()
+
+
+def _page_etag(request: HttpRequest, *parts: object) -> str | None:
+    # base.html renders pending flash messages; a 304 would swallow them, so skip the validator.
+    if len(messages.get_messages(request)):
+        return None
+    # Rendered HTML differs per visitor (navbar, CSRF form, read-only cards), so the user is part of the validator.
+    digest = hashlib.md5(usedforsecurity=False)
+    digest.update(json.dumps([_page_etag_seed(), request.user.pk, *parts], default=str).encode())
+    return digest.hexdigest()
+
+
+def _revalidate_marketing_page(view):  # noqa: ANN001, ANN202
+    # Browsers must revalidate every visit so the ETag sees login/logout; a page that renders
+    # one-time flash messages is never stored, or Back would show them again.
+    @wraps(view)
+    def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        has_messages = bool(len(messages.get_messages(request)))
+        response = view(request, *args, **kwargs)
+        if has_messages:
+            add_never_cache_headers(response)
+        else:
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    return wrapper
+
+
+def _landing_etag(request: HttpRequest) -> str | None:
+    # Hero images rotate per render; a visitor keeps their set for one rotation bucket.
+    rotation_bucket = int(time.time() // HERO_ROTATION_SECONDS)
+    return _page_etag(request, rotation_bucket, provider_status())
 
 
 @require_GET
+@_revalidate_marketing_page
+@condition(etag_func=_landing_etag)
 def landing(request: HttpRequest) -> HttpResponse:
     context = {
-        "hero_images": get_rotating_hero_images(),
+        "hero_images": get_cached_hero_images(),
         "providers": provider_status(),
     }
     return render(request, "planner/landing.html", context)
@@ -149,13 +247,9 @@ def healthz(_request: HttpRequest) -> HttpResponse:
     return HttpResponse("ok", content_type="text/plain")
 
 
-@require_GET
-def why_view(request: HttpRequest) -> HttpResponse:
-    why_images = _why_image_paths()
-    context = {
-        "why_images": why_images,
-        "why_image_count": len(why_images),
-        "why_benefits": [
+_WHY_CONTEXT = MappingProxyType(
+    {
+        "why_benefits": (
             {
                 "icon": "⏱",
                 "title": "Stop the comparison marathon",
@@ -186,22 +280,22 @@ def why_view(request: HttpRequest) -> HttpResponse:
                 "title": "Book anywhere you want",
                 "body": "TriPPlanner is a links-only planner. We rank and route you to outbound affiliate links so you stay in control of where you actually book.",
             },
-        ],
-        "why_steps": [
+        ),
+        "why_steps": (
             "Type your trip request (chat-like)",
             "We normalize airports, dates, and budget",
             "We fetch signals (flights, hotels, tours, places)",
             "We build real packages with a total cost breakdown",
             "You click outbound links and book anywhere you want",
-        ],
-        "why_audiences": [
+        ),
+        "why_audiences": (
             "Solo travelers who want fast comparisons without spreadsheeting every site",
             "Couples planning city breaks with a clear budget target",
             "Families comparing convenience, stops, and hotel fit",
             "Business travelers who need quick airport-to-airport options and time-aware ranking",
             "Flexible planners exploring destinations instead of starting with a fixed city",
-        ],
-        "why_testimonials": [
+        ),
+        "why_testimonials": (
             {
                 "quote": "I stopped bouncing between tabs. The total breakdown made it obvious which option was actually better value.",
                 "person": "A couple planning a long weekend",
@@ -214,8 +308,8 @@ def why_view(request: HttpRequest) -> HttpResponse:
                 "quote": "I liked that it was links-only. No pressure to book inside the app, just solid options and clear totals.",
                 "person": "A family trip planner",
             },
-        ],
-        "why_faqs": [
+        ),
+        "why_faqs": (
             {
                 "q": "Do you book flights or hotels?",
                 "a": "No. TriPPlanner is links-only. We do not run a booking engine, take payments, or create reservations.",
@@ -236,7 +330,27 @@ def why_view(request: HttpRequest) -> HttpResponse:
                 "q": "Can I still book on my preferred provider?",
                 "a": "Yes. That is the point of links-only planning. Use the ranked package as a decision layer, then book on the provider site you prefer.",
             },
-        ],
+        ),
+    }
+)
+
+
+_WHY_ETAG = hashlib.md5(json.dumps(dict(_WHY_CONTEXT), sort_keys=True, default=str).encode(), usedforsecurity=False).hexdigest()
+
+
+def _why_etag(request: HttpRequest) -> str | None:
+    return _page_etag(request, _WHY_ETAG, _why_image_paths())
+
+
+@require_GET
+@_revalidate_marketing_page
+@condition(etag_func=_why_etag)
+def why_view(request: HttpRequest) -> HttpResponse:
+    why_images = _why_image_paths()
+    context = {
+        **_WHY_CONTEXT,
+        "why_images": why_images,
+        "why_image_count": len(why_images),
     }
     return render(request, "planner/why.html", context)
 
@@ -262,7 +376,7 @@ def profile_view(request: HttpRequest) -> HttpResponse:
             messages.success(request, "Personal info updated.")
             return redirect("profile")
         messages.error(request, "Please fix the highlighted fields.")
-    saved_places = list(
+    saved_places_queryset = (
         SavedPlace.objects.filter(user=request.user)
         .only(
             "id",
@@ -279,14 +393,17 @@ def profile_view(request: HttpRequest) -> HttpResponse:
         )
         .order_by("-created_at")
     )
+    paginator = Paginator(saved_places_queryset, SAVED_PLACES_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get("page"))
     return render(
         request,
         "planner/profile.html",
         {
             "personal_info_form": personal_info_form,
-            "saved_places": saved_places,
-            "saved_places_count": len(saved_places),
-            "saved_place_fallback_image": static("img/destinations/travel-adventure-japan-night-landscape.jpg"),
+            "saved_places": page_obj.object_list,
+            "saved_places_page": page_obj,
+            "saved_places_count": paginator.count,
+            "saved_place_fallback_image": _SAVED_PLACE_FALLBACK_IMAGE,
         },
     )
 
@@ -302,14 +419,16 @@ def wizard_view(request: HttpRequest) -> HttpResponse:
     initial["search_mode"] = PlanRequest.SearchMode.DIRECT
 
     form = PlannerWizardForm(request.POST or None, initial=initial)
-    wizard_idempotency_key = _get_or_create_wizard_idempotency_key(request)
+    wizard_idempotency_key, is_new_key = _get_wizard_idempotency_key(request)
     if request.method == "POST" and form.is_valid():
         submitted_key = str(request.POST.get("idempotency_key") or "").strip()
         idempotency_key = submitted_key or wizard_idempotency_key
         plan = create_plan_request(request.user, form.to_plan_payload(), idempotency_key=f"wizard:{idempotency_key}")
-        request.session[WIZARD_IDEMPOTENCY_SESSION_KEY] = uuid4().hex
-        return redirect("planner:results", plan_id=plan.id)
-    return render(
+        response = redirect("planner:results", plan_id=plan.id)
+        # Rotate so the next wizard render mints a fresh key.
+        response.delete_cookie(WIZARD_IDEMPOTENCY_COOKIE, samesite="Lax")
+        return response
+    response = render(
         request,
         "planner/planner_wizard.html",
         {
@@ -318,6 +437,9 @@ def wizard_view(request: HttpRequest) -> HttpResponse:
             "idempotency_key": wizard_idempotency_key,
         },
     )
+    if is_new_key:
+        _set_wizard_idempotency_cookie(response, wizard_idempotency_key)
+    return response
 
 
 @login_required
@@ -358,7 +480,7 @@ def public_share_view(request: HttpRequest, token: str) -> HttpResponse:
 def package_detail_public_view(request: HttpRequest, token: str, package_id: str) -> HttpResponse:
     plan = get_object_or_404(PlanRequest, public_token=token)
     package = get_object_or_404(
-        PackageOption.objects.select_related("plan", "candidate", "flight_option", "hotel_option").prefetch_related("tour_options"),
+        PackageOption.objects.select_related("plan", "candidate", "flight_option", "hotel_option"),
         pk=package_id,
         plan=plan,
     )
@@ -374,14 +496,62 @@ def package_detail_public_view(request: HttpRequest, token: str, package_id: str
     )
 
 
+def _resolve_plan_for_partial(request: HttpRequest, plan_id: str) -> PlanRequest:
+    # Memoized on the request: both the ETag function and the view body need the plan.
+    # The package fingerprint rides along in the same query for _partial_etag.
+    plan = getattr(request, "_partial_plan", None)
+    if plan is None:
+        queryset = PlanRequest.objects.annotate(
+            package_total=Count("package_options"),
+            packages_updated_at=Max("package_options__updated_at"),
+        )
+        if request.user.is_authenticated:
+            plan = _plan_for_user_or_404(request.user, plan_id, queryset)
+        else:
+            token = request.GET.get("token", "")
+            plan = get_object_or_404(queryset, pk=plan_id, public_token=token)
+        request._partial_plan = plan
+    return plan
+
+
+def _partial_etag(request: HttpRequest, plan_id: str) -> str | None:
+    # Pipeline status updates use queryset.update(), which leaves updated_at alone, so the
+    # progress fields are part of the validator as well. Package refreshes recreate the rows
+    # and can finish on the same status and message, hence the package fingerprint.
+    plan = _resolve_plan_for_partial(request, plan_id)
+    return _page_etag(
+        request,
+        plan.updated_at,
+        plan.completed_at,
+        plan.status,
+        plan.progress_percent,
+        plan.progress_message,
+        plan.error_message,
+        plan.package_total,
+        plan.packages_updated_at,
+        request.GET.get("sort", "best_value"),
+    )
+
+
+def _keep_swap_target_when_not_modified(view):  # noqa: ANN001, ANN202
+    # htmx would otherwise swap the empty 304 body into the polled element.
+    @wraps(view)
+    def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        response = view(request, *args, **kwargs)
+        if response.status_code == 304:
+            response["HX-Reswap"] = "none"
+        return response
+
+    return wrapper
+
+
 @require_GET
 @never_cache
+@vary_on_headers("HX-Request")
+@_keep_swap_target_when_not_modified
+@condition(etag_func=_partial_etag)
 def progress_partial(request: HttpRequest, plan_id: str) -> HttpResponse:
-    if request.user.is_authenticated:
-        plan = _plan_for_user_or_404(request.user, plan_id)
-    else:
-        token = request.GET.get("token", "")
-        plan = get_object_or_404(PlanRequest, pk=plan_id, public_token=token)
+    plan = _resolve_plan_for_partial(request, plan_id)
     response = render(
         request,
         "planner/partials/progress_panel.html",
@@ -396,13 +566,11 @@ def progress_partial(request: HttpRequest, plan_id: str) -> HttpResponse:
 
 @require_GET
 @never_cache
+@vary_on_headers("HX-Request")
+@_keep_swap_target_when_not_modified
+@condition(etag_func=_partial_etag)
 def package_cards_partial(request: HttpRequest, plan_id: str) -> HttpResponse:
-    if request.user.is_authenticated:
-        plan = _plan_for_user_or_404(request.user, plan_id)
-    else:
-        token = request.GET.get("token", "")
-        plan = get_object_or_404(PlanRequest, pk=plan_id, public_token=token)
-
+    plan = _resolve_plan_for_partial(request, plan_id)
     sort_mode = request.GET.get("sort", "best_value")
     packages = _visible_packages(plan, sort_mode)
     package_count = len(packages)
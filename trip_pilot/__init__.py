@@ -1,4 +1,3 @@
-from . import sqlite_pragma  # noqa: F401
 from .celery import app as celery_app
 
 __all__ = ("celery_app",)
@@ -1,8 +1,11 @@
 import os
 
 from django.core.asgi import get_asgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "trip_pilot.settings")
 
 application = get_asgi_application()
 
+# Load the URLconf and its include()d modules at boot rather than on the first request.
+get_resolver().url_patterns  # noqa: B018
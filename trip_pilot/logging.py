@@ -1,21 +1,22 @@
 import contextvars
 import uuid
 
+_EMPTY_CONTEXT = ("-", "-")
 
-_request_context: contextvars.ContextVar[dict] = contextvars.ContextVar(
+# (request_id, plan_id); replaced wholesale so readers never see a partially updated value.
+_request_context: contextvars.ContextVar[tuple[str, str]] = contextvars.ContextVar(
     "request_context",
-    default={},
+    default=_EMPTY_CONTEXT,
 )
 
 
-def set_request_context(**kwargs: str) -> None:
-    current = _request_context.get({}).copy()
-    current.update({k: v for k, v in kwargs.items() if v})
-    _request_context.set(current)
+def set_request_context(request_id: str | None = None, plan_id: str | None = None) -> None:
+    current_request_id, current_plan_id = _request_context.get()
+    _request_context.set((request_id or current_request_id, plan_id or current_plan_id))
 
 
 def clear_request_context() -> None:
-    _request_context.set({})
+    _request_context.set(_EMPTY_CONTEXT)
 
 
 def new_request_id() -> str:
@@ -24,8 +25,5 @@ def new_request_id() -> str:
 
 class RequestContextFilter:
     def filter(self, record) -> bool:  # noqa: ANN001
-        context = _request_context.get({})
-        record.request_id = context.get("request_id", "-")
-        record.plan_id = context.get("plan_id", "-")
+        record.request_id, record.plan_id = _request_context.get()
         return True
-
@@ -2,29 +2,56 @@ import os
 from pathlib import Path
 
 import dj_database_url
-from dotenv import load_dotenv
 
 BASE_DIR = Path(__file__).resolve().parent.parent
-load_dotenv(BASE_DIR / ".env")
+
+
+def _load_env(path: Path) -> None:
+    # Minimal KEY=VALUE reader; like python-dotenv it never overrides variables already set.
+    if not path.is_file():
+        return
+    for line in path.read_text(encoding="utf-8-sig").splitlines():
+        line = line.strip()
+        if not line or line[0] == "#":
+            continue
+        key, sep, value = line.removeprefix("export ").partition("=")
+        key = key.strip()
+        if not sep or not key.isidentifier():
+            continue
+        value = value.strip()
+        closing = value.find(value[0], 1) if value[:1] in ("'", '"') else -1
+        if closing > 0:
+            # Text after the closing quote (e.g. an inline comment) is ignored.
+            value = value[1:closing]
+        else:
+            value = value.split(" #", 1)[0].rstrip()
+        os.environ.setdefault(key, value)
+
+
+_load_env(BASE_DIR / ".env")
+# Settings are read once at import; look them up in a plain dict rather than the os.environ proxy.
+_ENV = dict(os.environ)
+_TRUE = frozenset(("1", "true", "yes", "on"))
 
 
 def env_bool(name: str, default: bool = False) -> bool:
-    value = os.getenv(name)
+    value = _ENV.get(name)
     if value is None:
         return default
-    return value.strip().lower() in {"1", "true", "yes", "on"}
+    return value.strip().lower() in _TRUE
 
 
 def env_list(name: str, default: str = "") -> list[str]:
-    raw = os.getenv(name, default)
-    return [item.strip() for item in raw.split(",") if item.strip()]
+    raw = _ENV.get(name, default)
+    return [value for item in raw.split(",") if (value := item.strip())]
 
 
-DATABASE_URL = os.getenv("DATABASE_URL", "").strip()
-REDIS_URL = os.getenv("REDIS_URL", "").strip()
+DATABASE_URL = _ENV.get("DATABASE_URL", "").strip()
+REDIS_URL = _ENV.get("REDIS_URL", "").strip()
 
-SECRET_KEY = os.getenv("DJANGO_SECRET_KEY", "dev-only-unsafe-secret-key")
+SECRET_KEY = _ENV.get("DJANGO_SECRET_KEY", "dev-only-unsafe-secret-key")
 DEBUG = env_bool("DJANGO_DEBUG", default=not bool(DATABASE_URL))
+_PROD = not DEBUG
 
 ALLOWED_HOSTS = env_list("DJANGO_ALLOWED_HOSTS", "localhost,127.0.0.1,testserver,.onrender.com")
 CSRF_TRUSTED_ORIGINS = env_list(
@@ -76,9 +103,11 @@ WSGI_APPLICATION = "trip_pilot.wsgi.application"
 ASGI_APPLICATION = "trip_pilot.asgi.application"
 
 DATABASES = {
-    "default": dj_database_url.config(
-        default=os.getenv("DATABASE_URL", f"sqlite:///{(BASE_DIR / 'db.sqlite3').as_posix()}"),
-        conn_max_age=int(os.getenv("DB_CONN_MAX_AGE", "60")),
+    # Parse the DATABASE_URL already read above instead of having dj_database_url re-read the env.
+    "default": dj_database_url.parse(
+        DATABASE_URL or f"sqlite:///{(BASE_DIR / 'db.sqlite3').as_posix()}",
+        conn_max_age=int(_ENV.get("DB_CONN_MAX_AGE", "600")),
+        conn_health_checks=True,
     )
 }
 
@@ -89,6 +118,9 @@ if REDIS_URL:
             "LOCATION": REDIS_URL,
         }
     }
+    # Keep session reads/writes off the database when Redis is available.
+    SESSION_ENGINE = "django.contrib.sessions.backends.cache"
+    SESSION_CACHE_ALIAS = "default"
 else:
     CACHES = {
         "default": {
@@ -116,21 +148,20 @@ STORAGES = {
     "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
     "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
 }
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
-SESSION_COOKIE_SECURE = env_bool("SESSION_COOKIE_SECURE", default=not DEBUG)
-CSRF_COOKIE_SECURE = env_bool("CSRF_COOKIE_SECURE", default=not DEBUG)
+SESSION_COOKIE_SECURE = env_bool("SESSION_COOKIE_SECURE", default=_PROD)
+CSRF_COOKIE_SECURE = env_bool("CSRF_COOKIE_SECURE", default=_PROD)
 CSRF_COOKIE_HTTPONLY = True
 SESSION_COOKIE_HTTPONLY = True
-SECURE_SSL_REDIRECT = env_bool("SECURE_SSL_REDIRECT", default=not DEBUG)
+SECURE_SSL_REDIRECT = env_bool("SECURE_SSL_REDIRECT", default=_PROD)
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 SECURE_CONTENT_TYPE_NOSNIFF = True
 SECURE_REFERRER_POLICY = "same-origin"
 X_FRAME_OPTIONS = "DENY"
-if not DEBUG:
-    SECURE_HSTS_SECONDS = int(os.getenv("SECURE_HSTS_SECONDS", "31536000"))
+if _PROD:
+    SECURE_HSTS_SECONDS = int(_ENV.get("SECURE_HSTS_SECONDS", "31536000"))
     SECURE_HSTS_INCLUDE_SUBDOMAINS = env_bool("SECURE_HSTS_INCLUDE_SUBDOMAINS", True)
     SECURE_HSTS_PRELOAD = env_bool("SECURE_HSTS_PRELOAD", True)
 
@@ -152,8 +183,8 @@ REST_FRAMEWORK = {
     },
 }
 
-CELERY_BROKER_URL = os.getenv("REDIS_URL")
-CELERY_RESULT_BACKEND = os.getenv("REDIS_URL")
+CELERY_BROKER_URL = REDIS_URL or None
+CELERY_RESULT_BACKEND = CELERY_BROKER_URL
 CELERY_TASK_ALWAYS_EAGER = not bool(CELERY_BROKER_URL)
 CELERY_TASK_EAGER_PROPAGATES = True
 CELERY_TASK_ACKS_LATE = True
@@ -168,18 +199,22 @@ CELERY_BEAT_SCHEDULE = {} if CELERY_TASK_ALWAYS_EAGER else {
     "cleanup-old-plans": {
         "task": "planner.tasks.cleanup_old_plans",
         "schedule": 86400,
-    }
+    },
+    "refresh-hero-images": {
+        "task": "planner.tasks.refresh_hero_images",
+        "schedule": 1800,
+    },
 }
 
 TRIPPILOT_LINKS_ONLY = env_bool("TRIPPILOT_LINKS_ONLY", True)
-DEFAULT_ORIGIN_IATA = os.getenv("DEFAULT_ORIGIN_IATA", "TBS")
+DEFAULT_ORIGIN_IATA = _ENV.get("DEFAULT_ORIGIN_IATA", "TBS")
 TRAVELPAYOUTS_ENABLED = env_bool("TRAVELPAYOUTS_ENABLED", True)
-TRAVELPAYOUTS_API_TOKEN = os.getenv("TRAVELPAYOUTS_API_TOKEN")
-TRAVELPAYOUTS_MARKER = os.getenv("TRAVELPAYOUTS_MARKER")
-TRAVELPAYOUTS_BASE_CURRENCY = os.getenv("TRAVELPAYOUTS_BASE_CURRENCY", "USD")
-FX_API_KEY = os.getenv("FX_API_KEY")
-FX_API_URL = os.getenv("FX_API_URL")
-FX_QUOTE_CURRENCIES = [code.strip() for code in os.getenv("FX_QUOTE_CURRENCIES", "USD,EUR").split(",") if code.strip()]
+TRAVELPAYOUTS_API_TOKEN = _ENV.get("TRAVELPAYOUTS_API_TOKEN")
+TRAVELPAYOUTS_MARKER = _ENV.get("TRAVELPAYOUTS_MARKER")
+TRAVELPAYOUTS_BASE_CURRENCY = _ENV.get("TRAVELPAYOUTS_BASE_CURRENCY", "USD")
+FX_API_KEY = _ENV.get("FX_API_KEY")
+FX_API_URL = _ENV.get("FX_API_URL")
+FX_QUOTE_CURRENCIES = env_list("FX_QUOTE_CURRENCIES", "USD,EUR")
 
 LOGGING = {
     "version": 1,
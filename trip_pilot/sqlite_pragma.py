@@ -1,20 +1,46 @@
 from __future__ import annotations
 
 import logging
+import sys
+import threading
 
+from django.conf import settings
 from django.db.backends.signals import connection_created
 
 logger = logging.getLogger(__name__)
 
+# journal_mode=WAL persists in the database file, so it only needs to run once per database;
+# the rest are per-connection settings.
+_DATABASE_PRAGMAS = "PRAGMA journal_mode=WAL;"
+_CONNECTION_PRAGMAS = """
+PRAGMA foreign_keys=ON;
+PRAGMA synchronous=NORMAL;
+PRAGMA busy_timeout=30000;
+PRAGMA cache_size=-64000;
+PRAGMA temp_store=MEMORY;
+"""
+if sys.platform != "win32":
+    # Memory-mapped reads of up to 128 MiB of the database file; left off on Windows, where
+    # mapped files cannot be truncated (e.g. by VACUUM) while the map is open.
+    _CONNECTION_PRAGMAS += "PRAGMA mmap_size=134217728;\n"
+_wal_databases: set[str] = set()
+_wal_lock = threading.Lock()
+
 
 def _configure_sqlite(connection) -> None:  # noqa: ANN001
     if connection.vendor != "sqlite":
         return
-    with connection.cursor() as cursor:
-        cursor.execute("PRAGMA journal_mode=WAL;")
-        cursor.execute("PRAGMA foreign_keys=ON;")
-        cursor.execute("PRAGMA synchronous=NORMAL;")
-        cursor.execute("PRAGMA busy_timeout=30000;")
+    # One call on the raw sqlite3 connection; no transaction is open yet, so the implicit COMMIT
+    # executescript issues first is a no-op.
+    raw_connection = connection.connection
+    raw_connection.executescript(_CONNECTION_PRAGMAS)
+    database_name = str(connection.settings_dict["NAME"])
+    if database_name in _wal_databases:
+        return
+    with _wal_lock:
+        if database_name not in _wal_databases:
+            raw_connection.executescript(_DATABASE_PRAGMAS)
+            _wal_databases.add(database_name)
 
 
 def _sqlite_pragma_on_connect(sender, connection, **kwargs) -> None:  # noqa: ANN001, ARG001
@@ -24,4 +50,8 @@ def _sqlite_pragma_on_connect(sender, connection, **kwargs) -> None:  # noqa: AN
         logger.exception("Failed to apply SQLite PRAGMA settings.")
 
 
-connection_created.connect(_sqlite_pragma_on_connect, dispatch_uid="trip_pilot.sqlite_pragma")
+def install() -> None:
+    # Called from PlannerConfig.ready(), once settings are loaded; Postgres-only deployments then
+    # never dispatch to the handler at all.
+    if any(config.get("ENGINE", "").endswith("sqlite3") for config in settings.DATABASES.values()):
+        connection_created.connect(_sqlite_pragma_on_connect, dispatch_uid="trip_pilot.sqlite_pragma")